@@ -6,43 +6,115 @@ Y分支基础仿真设置
 import numpy as np
 import sys
 import os
+import hashlib
+import json
+import weakref
 
-# 设置Lumerical API路径
-lumerical_path = r"D:\Lumerical\v202\api\python"
-if lumerical_path not in sys.path:
-    sys.path.append(lumerical_path)
+# 基础仿真缓存目录
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".y_branch_cache")
 
-import lumapi
+# 仿真对象是否为MODE的检测结果，按对象缓存
+_MODE_CACHE = weakref.WeakKeyDictionary()
 
 
-def setup_base_simulation_mode(sim, wavelength_start=1300e-9, wavelength_stop=1800e-9):
+def _is_mode(sim):
+    """判断仿真对象是否为MODE（否则视为FDTD）"""
+    is_mode = _MODE_CACHE.get(sim)
+    if is_mode is None:
+        # 首次判断时才导入lumapi；lumapi不可用时按类名判断
+        try:
+            import lumapi
+            is_mode = isinstance(sim, lumapi.MODE)
+        except ImportError:
+            is_mode = type(sim).__name__ == 'MODE'
+        _MODE_CACHE[sim] = is_mode
+    return is_mode
+
+
+def _product_version(sim):
+    """返回仿真产品类型及版本号，用于区分不同版本生成的缓存文件"""
+    try:
+        version = sim.version()
+    except Exception:
+        version = "unknown"
+    return type(sim).__name__, str(version)
+
+
+def _format_lsf_value(value):
+    """将Python值转换为LSF脚本字面量"""
+    if isinstance(value, str):
+        return '"' + value + '"'
+    return repr(float(value))
+
+
+def _set_required(sim, props):
     """
-    为MODE设置Y分支基础仿真环境 (2.5D)
+    通过一次eval设置当前选中对象的一组必需属性，减少API往返
     
     参数:
-        sim: MODE仿真对象
-        wavelength_start: 起始波长 (m)
-        wavelength_stop: 终止波长 (m)
+        sim: 仿真对象
+        props: (属性名, 值) 列表
     """
-
-    # 帮助定位属性设置错误，便于排查接口字段名
-    def safe_set(name, value):
+    if not props:
+        return
+    
+    script = "".join(f'set("{name}", {_format_lsf_value(value)});\n' for name, value in props)
+    try:
+        sim.eval(script)
+        return
+    except Exception as e:
+        print(f"[batch_set] 批量设置失败，逐项重试以定位字段: {e}")
+    
+    # 逐项设置，帮助定位属性设置错误，便于排查接口字段名
+    for name, value in props:
         try:
             sim.set(name, value)
         except Exception as e:
             print(f"[safe_set] set('{name}', {value}) 失败: {e}")
             raise
 
-    # 可选字段，失败时仅提示不终止
-    def soft_set(name, value):
+
+def _apply_properties(sim, props):
+    """
+    按顺序设置当前选中对象的属性：连续的必需属性合并为一次eval，
+    可选属性逐项设置，失败时仅提示不终止
+    
+    参数:
+        sim: 仿真对象
+        props: (属性名, 值, 是否可选) 列表
+    """
+    required = []
+    for name, value, optional in props:
+        if not optional:
+            required.append((name, value))
+            continue
+        
+        # 可选字段可能不被当前产品支持，单独设置以免中断批量eval
+        _set_required(sim, required)
+        required = []
         try:
             sim.set(name, value)
         except Exception as e:
             print(f"[soft_set] 跳过 set('{name}', {value}): {e}")
+    _set_required(sim, required)
+
+
+def _simulation_ops(wavelength_start, wavelength_stop, is_3d):
+    """
+    生成基础仿真的对象操作列表
     
+    参数:
+        wavelength_start: 起始波长 (m)
+        wavelength_stop: 终止波长 (m)
+        is_3d: True为FDTD (3D)，False为MODE (2.5D)
+        
+    返回:
+        (ops, params): 操作列表和基础仿真参数
+    """
     # 仿真区域参数
     sim_length = 6e-6  # 6微米
     sim_width = 6e-6   # 6微米
+    sim_height = 3e-6  # 3微米 (仅FDTD)
     
     # 波导参数
     waveguide_width = 0.5e-6   # 500nm
@@ -53,325 +125,294 @@ def setup_base_simulation_mode(sim, wavelength_start=1300e-9, wavelength_stop=18
     n_si = 3.48   # 硅
     n_sio2 = 1.44  # 二氧化硅
     
-    print("MODE 2.5D 仿真设置")
-    print("="*50)
-    print("设置仿真区域...")
-    
-    # 添加varFDTD区域（MODE中用于参数优化）
-    sim.addvarfdtd()
-    safe_set("x", 0)
-    safe_set("y", 0)
-    safe_set("x span", sim_length)
-    safe_set("y span", sim_width)
-    safe_set("mesh accuracy", 3)
-    safe_set("simulation time", 1000e-15)  # 1ps
-    
-    # 设置边界条件
-    safe_set("x min bc", "PML")
-    safe_set("x max bc", "PML")
-    safe_set("y min bc", "PML")
-    safe_set("y max bc", "PML")
-    
-    print("添加材料...")
-    
-    # 添加基底材料 (SiO2) - 背景
-    sim.addrect()
-    safe_set("name", "substrate")
-    safe_set("x", 0)
-    safe_set("y", 0)
-    safe_set("x span", sim_length)
-    safe_set("y span", sim_width)
-    safe_set("index", n_sio2)
-    safe_set("alpha", 0.3)  # 透明度
-    
-    print("添加输入波导...")
-    
-    # 输入波导
-    sim.addrect()
-    safe_set("name", "input_waveguide")
-    safe_set("x", -sim_length/2 + 1e-6)
-    safe_set("x span", 2e-6)
-    safe_set("y", 0)
-    safe_set("y span", waveguide_width)
-    safe_set("index", n_si)
-    
-    print("添加输出波导...")
-    
-    # 输出波导1 (上方) - 与输入波导对齐后逐渐分开
-    sim.addrect()
-    safe_set("name", "output_waveguide_1")
-    safe_set("x", sim_length/2 - 1e-6)
-    safe_set("x span", 2e-6)
-    safe_set("y", waveguide_spacing/2)  # 最终位置
-    safe_set("y span", waveguide_width)
-    safe_set("index", n_si)
-    
-    # 输出波导2 (下方) - 与输入波导对齐后逐渐分开
-    sim.addrect()
-    safe_set("name", "output_waveguide_2")
-    safe_set("x", sim_length/2 - 1e-6)
-    safe_set("x span", 2e-6)
-    safe_set("y", -waveguide_spacing/2)  # 最终位置
-    safe_set("y span", waveguide_width)
-    safe_set("index", n_si)
-    
-    print("添加光源...")
-    
-    # 添加模式光源（TE基模）
-    sim.addmode()
-    soft_set("injection axis", "x-axis")
-    soft_set("direction", "Forward")
-    safe_set("x", -sim_length/2 + 0.5e-6)
-    safe_set("y", 0)
-    safe_set("y span", 1.5e-6)
-    soft_set("wavelength start", wavelength_start)
-    soft_set("wavelength stop", wavelength_stop)
-    
-    print("添加监视器...")
-    
-    # 添加优化区域字段监视器
-    sim.addpower()
-    safe_set("name", "opt_fields")
-    safe_set("x", 0)
-    safe_set("x span", 2.5e-6)
-    safe_set("y", 0)
-    safe_set("y span", 3e-6)
-    
-    # 添加FOM监视器 - 输出1
-    sim.addpower()
-    safe_set("name", "fom_monitor_1")
-    safe_set("x", sim_length/2 - 0.5e-6)
-    safe_set("y", waveguide_spacing/2)
-    safe_set("y span", 1.5e-6)
-    
-    # 添加FOM监视器 - 输出2
-    sim.addpower()
-    safe_set("name", "fom_monitor_2")
-    safe_set("x", sim_length/2 - 0.5e-6)
-    safe_set("y", -waveguide_spacing/2)
-    safe_set("y span", 1.5e-6)
-    
-    # 添加网格覆盖
-    sim.addmesh()
-    safe_set("name", "opt_mesh")
-    safe_set("x", 0)
-    safe_set("x span", 2.5e-6)
-    safe_set("y", 0)
-    safe_set("y span", 3e-6)
-    safe_set("dx", 20e-9)  # 20nm网格
-    safe_set("dy", 20e-9)
-    
-    print("MODE基础仿真设置完成！")
-    print("="*50)
-    
-    return {
-        'sim_length': sim_length,
-        'sim_width': sim_width,
+    def z_props(span=None):
+        """3D时追加的z方向属性"""
+        if not is_3d:
+            return {}
+        if span is None:
+            return {"z": 0}
+        return {"z": 0, "z span": span}
+    
+    def monitor_type(value):
+        """3D时需要指定的监视器类型"""
+        return {"monitor type": value} if is_3d else {}
+    
+    # 仿真区域（MODE中使用varFDTD区域进行参数优化）
+    region = {
+        "x": 0,
+        "y": 0,
+        "x span": sim_length,
+        "y span": sim_width,
+        **z_props(sim_height),
+        "mesh accuracy": 3,
+        "simulation time": 1000e-15,  # 1ps
+        # 边界条件
+        "x min bc": "PML",
+        "x max bc": "PML",
+        "y min bc": "PML",
+        "y max bc": "PML",
+    }
+    if is_3d:
+        region.update({"z min bc": "PML", "z max bc": "PML"})
+    
+    # 模式光源（TE基模），MODE中部分字段可能不存在，设为可选
+    source = {"name": "source"} if is_3d else {}
+    source.update({
+        "injection axis": "x-axis",
+        "direction": "Forward",
+        "x": -sim_length/2 + 0.5e-6,
+        "y": 0,
+        "y span": 1.5e-6,
+        **z_props(1.5e-6),
+        "wavelength start": wavelength_start,
+        "wavelength stop": wavelength_stop,
+    })
+    if is_3d:
+        source["mode selection"] = "fundamental TE mode"
+    
+    ops = [
+        {"op": "addfdtd" if is_3d else "addvarfdtd", "message": "设置仿真区域...", "props": region},
+        # 基底材料 (SiO2) - 背景
+        {"op": "addrect", "message": "添加材料...", "props": {
+            "name": "substrate",
+            "x": 0,
+            "y": 0,
+            "x span": sim_length,
+            "y span": sim_width,
+            **z_props(sim_height),
+            "index": n_sio2,
+            "alpha": 0.3,  # 透明度
+        }},
+        # 输入波导
+        {"op": "addrect", "message": "添加输入波导...", "props": {
+            "name": "input_waveguide",
+            "x": -sim_length/2 + 1e-6,
+            "x span": 2e-6,
+            "y": 0,
+            "y span": waveguide_width,
+            **z_props(waveguide_height),
+            "index": n_si,
+        }},
+        # 输出波导1 (上方)
+        {"op": "addrect", "message": "添加输出波导...", "props": {
+            "name": "output_waveguide_1",
+            "x": sim_length/2 - 1e-6,
+            "x span": 2e-6,
+            "y": waveguide_spacing/2,  # 最终位置
+            "y span": waveguide_width,
+            **z_props(waveguide_height),
+            "index": n_si,
+        }},
+        # 输出波导2 (下方)
+        {"op": "addrect", "props": {
+            "name": "output_waveguide_2",
+            "x": sim_length/2 - 1e-6,
+            "x span": 2e-6,
+            "y": -waveguide_spacing/2,  # 最终位置
+            "y span": waveguide_width,
+            **z_props(waveguide_height),
+            "index": n_si,
+        }},
+        {"op": "addmode", "message": "添加光源...", "props": source,
+         "optional": () if is_3d else ("injection axis", "direction", "wavelength start", "wavelength stop")},
+        # 优化区域字段监视器
+        {"op": "addpower", "message": "添加监视器...", "props": {
+            "name": "opt_fields",
+            **monitor_type("2D Z-normal"),
+            "x": 0,
+            "x span": 2.5e-6,
+            "y": 0,
+            "y span": 3e-6,
+            **z_props(),
+        }},
+        # FOM监视器 - 输出1
+        {"op": "addpower", "props": {
+            "name": "fom_monitor_1",
+            **monitor_type("2D X-normal"),
+            "x": sim_length/2 - 0.5e-6,
+            "y": waveguide_spacing/2,
+            "y span": 1.5e-6,
+            **z_props(1.5e-6),
+        }},
+        # FOM监视器 - 输出2
+        {"op": "addpower", "props": {
+            "name": "fom_monitor_2",
+            **monitor_type("2D X-normal"),
+            "x": sim_length/2 - 0.5e-6,
+            "y": -waveguide_spacing/2,
+            "y span": 1.5e-6,
+            **z_props(1.5e-6),
+        }},
+        # 网格覆盖 (20nm网格)
+        {"op": "addmesh", "props": {
+            "name": "opt_mesh",
+            "x": 0,
+            "x span": 2.5e-6,
+            "y": 0,
+            "y span": 3e-6,
+            **z_props(waveguide_height + 0.5e-6),
+            "dx": 20e-9,
+            "dy": 20e-9,
+            **({"dz": 20e-9} if is_3d else {}),
+        }},
+    ]
+    
+    params = {'sim_length': sim_length, 'sim_width': sim_width}
+    if is_3d:
+        params['sim_height'] = sim_height
+    params.update({
         'waveguide_width': waveguide_width,
         'waveguide_height': waveguide_height,
         'waveguide_spacing': waveguide_spacing,
         'n_si': n_si,
         'n_sio2': n_sio2
-    }
+    })
+    
+    return ops, params
 
 
-def setup_base_simulation_fdtd(sim, wavelength_start=1300e-9, wavelength_stop=1800e-9):
+def _run_ops(sim, ops):
     """
-    为FDTD设置Y分支基础仿真环境 (3D)
+    依次添加对象并批量设置其属性
     
     参数:
-        sim: FDTD仿真对象
-        wavelength_start: 起始波长 (m)
-        wavelength_stop: 终止波长 (m)
+        sim: 仿真对象
+        ops: _simulation_ops 生成的操作列表
     """
+    for op in ops:
+        if "message" in op:
+            print(op["message"])
+        getattr(sim, op["op"])()
+        optional = op.get("optional", ())
+        _apply_properties(sim, [(name, value, name in optional) for name, value in op["props"].items()])
+
+
+def _setup_base_simulation(sim, wavelength_start, wavelength_stop, is_3d):
+    """按仿真类型构建基础仿真环境，返回基础仿真参数"""
+    label = "FDTD" if is_3d else "MODE"
     
-    # 仿真区域参数
-    sim_length = 6e-6  # 6微米
-    sim_width = 6e-6   # 6微米
-    sim_height = 3e-6  # 3微米
-    
-    # 波导参数
-    waveguide_width = 0.5e-6   # 500nm
-    waveguide_height = 0.22e-6  # 220nm
-    waveguide_spacing = 2e-6    # 输出波导间距
+    print(f"{label} {'3D' if is_3d else '2.5D'} 仿真设置")
+    print("="*50)
     
-    # 材料设置
-    n_si = 3.48
-    n_sio2 = 1.44
+    ops, params = _simulation_ops(wavelength_start, wavelength_stop, is_3d)
+    _run_ops(sim, ops)
     
-    print("FDTD 3D 仿真设置")
+    print(f"{label}基础仿真设置完成！")
     print("="*50)
-    print("设置仿真区域...")
-    
-    # 添加FDTD区域
-    sim.addfdtd()
-    sim.set("x", 0)
-    sim.set("y", 0)
-    sim.set("z", 0)
-    sim.set("x span", sim_length)
-    sim.set("y span", sim_width)
-    sim.set("z span", sim_height)
-    sim.set("mesh accuracy", 3)
-    sim.set("simulation time", 1000e-15)  # 1ps
     
+    return params
 
-    # 设置边界条件
-    sim.set("x min bc", "PML")
-    sim.set("x max bc", "PML")
-    sim.set("y min bc", "PML")
-    sim.set("y max bc", "PML")
-    sim.set("z min bc", "PML")
-    sim.set("z max bc", "PML")
-    
-    print("添加材料...")
-    
-    # 添加基底
-    sim.addrect()
-    sim.set("name", "substrate")
-    sim.set("x", 0)
-    sim.set("y", 0)
-    sim.set("z", 0)
-    sim.set("x span", sim_length)
-    sim.set("y span", sim_width)
-    sim.set("z span", sim_height)
-    sim.set("index", n_sio2)
-    sim.set("alpha", 0.3)
-    
-    print("添加输入波导...")
-    
-    # 输入波导
-    sim.addrect()
-    sim.set("name", "input_waveguide")
-    sim.set("x", -sim_length/2 + 1e-6)
-    sim.set("x span", 2e-6)
-    sim.set("y", 0)
-    sim.set("y span", waveguide_width)
-    sim.set("z", 0)
-    sim.set("z span", waveguide_height)
-    sim.set("index", n_si)
-    
-    print("添加输出波导...")
-    
-    # 输出波导1 (上方) - 与输入波导对齐后逐渐分开
-    sim.addrect()
-    sim.set("name", "output_waveguide_1")
-    sim.set("x", sim_length/2 - 1e-6)
-    sim.set("x span", 2e-6)
-    sim.set("y", waveguide_spacing/2)  # 最终位置
-    sim.set("y span", waveguide_width)
-    sim.set("z", 0)
-    sim.set("z span", waveguide_height)
-    sim.set("index", n_si)
-    
-    # 输出波导2 (下方) - 与输入波导对齐后逐渐分开
-    sim.addrect()
-    sim.set("name", "output_waveguide_2")
-    sim.set("x", sim_length/2 - 1e-6)
-    sim.set("x span", 2e-6)
-    sim.set("y", -waveguide_spacing/2)  # 最终位置
-    sim.set("y span", waveguide_width)
-    sim.set("z", 0)
-    sim.set("z span", waveguide_height)
-    sim.set("index", n_si)
-    
-    print("添加光源...")
-    
-    # 模式光源
-    sim.addmode()
-    sim.set("name", "source")
-    sim.set("injection axis", "x-axis")
-    sim.set("direction", "Forward")
-    sim.set("x", -sim_length/2 + 0.5e-6)
-    sim.set("y", 0)
-    sim.set("z", 0)
-    sim.set("y span", 1.5e-6)
-    sim.set("z span", 1.5e-6)
-    sim.set("wavelength start", wavelength_start)
-    sim.set("wavelength stop", wavelength_stop)
-    sim.set("mode selection", "fundamental TE mode")
-    
-    print("添加监视器...")
-    
-    # 优化字段监视器
-    sim.addpower()
-    sim.set("name", "opt_fields")
-    sim.set("monitor type", "2D Z-normal")
-    sim.set("x", 0)
-    sim.set("x span", 2.5e-6)
-    sim.set("y", 0)
-    sim.set("y span", 3e-6)
-    sim.set("z", 0)
-    
-    # FOM监视器1
-    sim.addpower()
-    sim.set("name", "fom_monitor_1")
-    sim.set("monitor type", "2D X-normal")
-    sim.set("x", sim_length/2 - 0.5e-6)
-    sim.set("y", waveguide_spacing/2)
-    sim.set("y span", 1.5e-6)
-    sim.set("z", 0)
-    sim.set("z span", 1.5e-6)
-    
-    # FOM监视器2
-    sim.addpower()
-    sim.set("name", "fom_monitor_2")
-    sim.set("monitor type", "2D X-normal")
-    sim.set("x", sim_length/2 - 0.5e-6)
-    sim.set("y", -waveguide_spacing/2)
-    sim.set("y span", 1.5e-6)
-    sim.set("z", 0)
-    sim.set("z span", 1.5e-6)
-    
-    # 网格覆盖
-    sim.addmesh()
-    sim.set("name", "opt_mesh")
-    sim.set("x", 0)
-    sim.set("x span", 2.5e-6)
-    sim.set("y", 0)
-    sim.set("y span", 3e-6)
-    sim.set("z", 0)
-    sim.set("z span", waveguide_height + 0.5e-6)
-    sim.set("dx", 20e-9)
-    sim.set("dy", 20e-9)
-    sim.set("dz", 20e-9)
+
+def setup_base_simulation_mode(sim, wavelength_start=1300e-9, wavelength_stop=1800e-9):
+    """
+    为MODE设置Y分支基础仿真环境 (2.5D)
     
-    print("FDTD基础仿真设置完成！")
-    print("="*50)
+    参数:
+        sim: MODE仿真对象
+        wavelength_start: 起始波长 (m)
+        wavelength_stop: 终止波长 (m)
+    """
+    return _setup_base_simulation(sim, wavelength_start, wavelength_stop, is_3d=False)
+
+
+def setup_base_simulation_fdtd(sim, wavelength_start=1300e-9, wavelength_stop=1800e-9):
+    """
+    为FDTD设置Y分支基础仿真环境 (3D)
     
-    return {
-        'sim_length': sim_length,
-        'sim_width': sim_width,
-        'sim_height': sim_height,
-        'waveguide_width': waveguide_width,
-        'waveguide_height': waveguide_height,
-        'waveguide_spacing': waveguide_spacing,
-        'n_si': n_si,
-        'n_sio2': n_sio2
-    }
+    参数:
+        sim: FDTD仿真对象
+        wavelength_start: 起始波长 (m)
+        wavelength_stop: 终止波长 (m)
+    """
+    return _setup_base_simulation(sim, wavelength_start, wavelength_stop, is_3d=True)
 
 
-def setup_base_simulation(sim, wavelength_start=1300e-9, wavelength_stop=1800e-9):
+def setup_base_simulation(sim, wavelength_start=1300e-9, wavelength_stop=1800e-9, use_cache=True):
     """
     自动检测并设置基础仿真
     
+    已构建过的基础仿真按参数缓存为工程文件，再次调用时直接加载
+    
     参数:
         sim: 仿真对象（MODE或FDTD）
         wavelength_start: 起始波长
         wavelength_stop: 终止波长
+        use_cache: 是否使用磁盘缓存
     """
     print(f"[debug] sim python type: {type(sim)}")
     # 检测是否为MODE
-    is_mode = 'MODE' in str(type(sim))
+    is_mode = _is_mode(sim)
     
-    if is_mode:
-        return setup_base_simulation_mode(sim, wavelength_start, wavelength_stop)
-    else:
-        return setup_base_simulation_fdtd(sim, wavelength_start, wavelength_stop)
+    if not use_cache:
+        return _setup_base_simulation(sim, wavelength_start, wavelength_stop, is_3d=not is_mode)
+    
+    # 缓存文件名由产品版本与完整的对象操作列表哈希决定，任何参数变化时自动失效
+    ops, _ = _simulation_ops(wavelength_start, wavelength_stop, is_3d=not is_mode)
+    key = hashlib.sha1(repr((_product_version(sim), ops)).encode()).hexdigest()
+    extension = ".lms" if is_mode else ".fsp"
+    cache_path = os.path.join(CACHE_DIR, key + extension)
+    params_path = cache_path + ".json"
+    
+    # load/save会改变会话的当前工程文件和工作目录，结束后切回原工作目录，
+    # 保证后续优化文件仍保存在调用方的工作目录中
+    working_dir = sim.pwd()
+    try:
+        if os.path.exists(cache_path) and os.path.exists(params_path):
+            # 先读取并校验参数文件，参数文件损坏时不加载工程，直接重建
+            try:
+                with open(params_path, "r", encoding="utf-8") as f:
+                    params = json.load(f)
+                if not isinstance(params, dict):
+                    raise ValueError(f"参数文件格式错误: {params_path}")
+            except Exception as e:
+                print(f"警告: 缓存参数读取失败，重新构建基础仿真: {e}")
+                params = None
+            
+            if params is not None:
+                try:
+                    sim.load(cache_path)
+                    print(f"从缓存加载基础仿真: {cache_path}")
+                    return params
+                except Exception as e:
+                    print(f"警告: 缓存加载失败，重新构建基础仿真: {e}")
+                    # 工程可能已部分加载，清空后再重建，避免重复添加对象
+                    sim.switchtolayout()
+                    sim.deleteall()
+        
+        params = _setup_base_simulation(sim, wavelength_start, wavelength_stop, is_3d=not is_mode)
+        
+        # 先写入临时文件再重命名，避免并发运行时加载到未写完的工程文件
+        tmp_prefix = os.path.join(CACHE_DIR, f"{key}.{os.getpid()}.tmp")
+        tmp_cache_path = tmp_prefix + extension
+        tmp_params_path = tmp_prefix + ".json"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(tmp_params_path, "w", encoding="utf-8") as f:
+                json.dump(params, f, indent=2)
+            sim.save(tmp_cache_path)
+            os.replace(tmp_params_path, params_path)
+            os.replace(tmp_cache_path, cache_path)
+        except Exception as e:
+            print(f"警告: 无法写入基础仿真缓存: {e}")
+            for path in (tmp_cache_path, tmp_params_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        
+        return params
+    finally:
+        sim.cd(working_dir)
 
 
 if __name__ == "__main__":
     """测试基础设置"""
     
+    # 设置Lumerical API路径
+    lumerical_path = r"D:\Lumerical\v202\api\python"
+    if lumerical_path not in sys.path:
+        sys.path.append(lumerical_path)
+    
+    import lumapi
+    
     print("\n选择要测试的仿真器:")
     print("1. MODE (2.5D, 快速)")
     print("2. FDTD (3D, 精确)")
@@ -0,0 +1,83 @@
+"""
+Y分支几何批量构建内核
+使用numba并行构建多组参数对应的多边形，由 y_branch_lumopt.batch_polygons 按需导入
+"""
+
+import numpy as np
+
+from y_branch_geometry import cubic_spline_eval
+
+# numba可选：不可用时退化为串行纯Python
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """numba不可用时的占位装饰器，函数按原样执行"""
+        def decorator(func):
+            return func
+        return decorator
+
+
+# 与splitter_function共用同一样条实现，批量构建时编译为numba版本
+_cubic_spline_eval_jit = njit(cache=True)(cubic_spline_eval)
+
+
+@njit(cache=True)
+def _build_polygon(params, n_outer, points_x_outer, points_x_inner, poly_x_outer, poly_x_inner):
+    """与 splitter_function 相同的多边形构建流程（numba可编译版本）"""
+    n_inner = params.shape[0] - n_outer
+    
+    points_y_outer = np.empty(n_outer + 2)
+    points_y_outer[0] = params[0]
+    points_y_outer[1:-1] = params[:n_outer]
+    points_y_outer[-1] = params[n_outer - 1]
+    
+    points_y_inner = np.empty(n_inner + 2)
+    points_y_inner[0] = params[n_outer]
+    points_y_inner[1:-1] = params[n_outer:]
+    points_y_inner[-1] = params[-1]
+    
+    poly_y_outer = _cubic_spline_eval_jit(points_x_outer, points_y_outer, poly_x_outer)
+    poly_y_inner = _cubic_spline_eval_jit(points_x_inner, points_y_inner, poly_x_inner)
+    
+    # 上外边缘 -> 上内边缘(反向) -> 下内边缘 -> 下外边缘(反向)
+    n_o = poly_x_outer.shape[0]
+    n_i = poly_x_inner.shape[0]
+    out = np.empty((2 * (n_o + n_i), 2))
+    for k in range(n_o):
+        out[k, 0] = poly_x_outer[k]
+        out[k, 1] = poly_y_outer[k]
+        out[2 * (n_o + n_i) - 1 - k, 0] = poly_x_outer[k]
+        out[2 * (n_o + n_i) - 1 - k, 1] = -poly_y_outer[k]
+    for k in range(n_i):
+        out[n_o + n_i - 1 - k, 0] = poly_x_inner[k]
+        out[n_o + n_i - 1 - k, 1] = poly_y_inner[k]
+        out[n_o + n_i + k, 0] = poly_x_inner[k]
+        out[n_o + n_i + k, 1] = -poly_y_inner[k]
+    return out
+
+
+@njit(parallel=True, cache=True)
+def batch_polygons_kernel(params_batch, n_outer, points_x_outer, points_x_inner, poly_x_outer, poly_x_inner):
+    """
+    并行构建一批参数对应的多边形
+    
+    参数:
+        params_batch: 参数数组 (n_batch, n_params)
+        n_outer: 外边缘参数数量
+        points_x_outer, points_x_inner: 扩展后的外/内边缘节点x坐标
+        poly_x_outer, poly_x_inner: 外/内边缘插值点x坐标
+        
+    返回:
+        polygons: 多边形顶点数组 (n_batch, n_vertices, 2)
+    """
+    n_vertices = 2 * (poly_x_outer.shape[0] + poly_x_inner.shape[0])
+    out = np.empty((params_batch.shape[0], n_vertices, 2))
+    for i in prange(params_batch.shape[0]):
+        out[i] = _build_polygon(params_batch[i], n_outer, points_x_outer, points_x_inner,
+                                poly_x_outer, poly_x_inner)
+    return out
@@ -4,7 +4,17 @@ Y分支几何优化定义
 """
 
 import numpy as np
-import scipy.interpolate as sp_interp
+from functools import lru_cache
+
+
+# 样条插值采样点：节点范围 -1.0μm ~ 1.0μm 两侧各延伸0.1μm，与参数取值无关
+_POLYGON_POINTS_X = np.linspace(-1.1e-6, 1.1e-6, 100)
+
+# 内边缘 (Inner Split) - V型切口，固定的线性过渡
+# 分叉点在 x=0, y=0，延伸至外边缘末端 x=1.1μm
+# 输出内侧 y=0.75 (输出波导中心1.0, 宽0.5 -> 内侧0.75)
+_INNER_EDGE = np.column_stack((np.linspace(0.0, 1.1e-6, 50), np.linspace(0.0, 0.75e-6, 50)))
+_INNER_EDGE.setflags(write=False)
 
 
 class YBranchGeometry:
@@ -49,62 +59,9 @@ class YBranchGeometry:
         返回:
             polygon_points: 多边形顶点坐标数组 (N, 2)
         """
-        # 1. 构建上边缘 (Outer Top)
-        points_x = np.concatenate((
-            [self.initial_points_x.min() - 0.1e-6],  # 输入侧延伸
-            self.initial_points_x,
-            [self.initial_points_x.max() + 0.1e-6]   # 输出侧延伸
-        ))
-        
-        points_y = np.concatenate((
-            [params[0]],      # 左端保持输入波导宽度
-            params,
-            [params[-1]]      # 右端保持输出波导位置
-        ))
-        
-        # 使用三次样条插值创建平滑曲线
-        n_interpolation_points = 100
-        polygon_points_x = np.linspace(min(points_x), max(points_x), n_interpolation_points)
-        
-        # 创建插值器
-        interpolator = sp_interp.interp1d(points_x, points_y, kind='cubic')
-        polygon_points_y = interpolator(polygon_points_x)
-        
-        # 2. 构建内边缘 (Inner Split) - V型切口
-        # 分叉点在 x=0, y=0
-        # 输出内侧在 x=1.0, y=0.75 (输出波导中心1.0, 宽0.5 -> 内侧0.75)
-        
-        x_split = 0.0e-6
-        x_end = max(points_x)
-        y_split = 0.0
-        y_inner_end = 0.75e-6
-        
-        # 定义内边缘点 (线性过渡)
-        inner_x = np.linspace(x_split, x_end, 50)
-        inner_y = np.linspace(y_split, y_inner_end, 50)
-        
-        # 3. 组合多边形
-        
-        # 上半部分外边缘点 (从左到右)
-        upper_outer = list(zip(polygon_points_x, polygon_points_y))
-        
-        # 上半部分内边缘点 (从右到左)
-        upper_inner = list(zip(inner_x, inner_y))[::-1]
-        
-        # 下半部分内边缘点 (从左到右，对称)
-        lower_inner = [(x, -y) for x, y in zip(inner_x, inner_y)]
-        
-        # 下半部分外边缘点 (从右到左，对称)
-        lower_outer = [(x, -y) for x, y in upper_outer[::-1]]
-        
-        # 组合所有点
-        final_points = []
-        final_points.extend(upper_outer)
-        final_points.extend(upper_inner)
-        final_points.extend(lower_inner)
-        final_points.extend(lower_outer)
-        
-        return np.array(final_points)
+        # 相同参数直接复用缓存结果，返回副本防止修改缓存
+        params = np.ascontiguousarray(params, dtype=np.float64)
+        return _geometry_polygon_cached(params.tobytes(), self.n_points).copy()
     
     def add_to_simulation(self, sim, params, depth=220e-9):
         """
@@ -115,7 +72,7 @@ class YBranchGeometry:
             params: 优化参数
             depth: 几何体厚度（z方向）
         """
-        # 生成多边形点
+        # 生成多边形点（连续的float64数组，与LSF双精度矩阵一致，可直接putv）
         polygon_points = self.create_polygon(params)
         
         # 检查是否已存在该结构
@@ -126,14 +83,19 @@ class YBranchGeometry:
             pass
         
         # 添加多边形
+        # 顶点通过putv直接写入脚本变量，所有属性在一次eval中设置
+        sim.putv("y_branch_verts", polygon_points)
         sim.addpoly()
-        sim.set("name", "y_branch_opt")
-        sim.set("x", 0)
-        sim.set("y", 0)
-        sim.set("z", 0)
-        sim.set("z span", depth)
-        sim.set("vertices", polygon_points)
-        sim.set("index", 3.48)  # 硅的折射率
+        sim.eval(
+            'set("name", "y_branch_opt");\n'
+            'set("x", 0);\n'
+            'set("y", 0);\n'
+            'set("z", 0);\n'
+            f'set("z span", {float(depth)!r});\n'
+            'set("vertices", y_branch_verts);\n'
+            'set("index", 3.48);\n'  # 硅的折射率
+            'clear(y_branch_verts);\n'
+        )
         
         return polygon_points
     
@@ -167,6 +129,164 @@ class YBranchGeometry:
         return polygon_points
 
 
+def cubic_spline_eval(xs, ys, xeval):
+    """
+    三次样条插值（not-a-knot边界，与scipy的CubicSpline一致）
+    
+    节点很少时直接用追赶法求解二阶导数，避免scipy的多层封装开销；
+    仅使用numpy基本运算，可被numba编译
+    
+    参数:
+        xs: 节点x坐标（严格递增，至少4个）
+        ys: 节点y坐标
+        xeval: 插值点x坐标
+        
+    返回:
+        插值点y坐标
+    """
+    n = xs.shape[0]
+    m = n - 2
+    h = xs[1:] - xs[:-1]
+    d = (ys[1:] - ys[:-1]) / h
+    
+    # 内部节点二阶导数M[1..n-2]的三对角方程组
+    sub = np.empty(m)
+    diag = np.empty(m)
+    sup = np.empty(m)
+    rhs = np.empty(m)
+    for i in range(m):
+        sub[i] = h[i]
+        diag[i] = 2.0 * (h[i] + h[i + 1])
+        sup[i] = h[i + 1]
+        rhs[i] = 6.0 * (d[i + 1] - d[i])
+    
+    # not-a-knot: 首尾两段三阶导数连续，消去M[0]和M[n-1]
+    r_left = h[0] / h[1]
+    r_right = h[n - 2] / h[n - 3]
+    diag[0] += h[0] * (1.0 + r_left)
+    sup[0] -= h[0] * r_left
+    diag[m - 1] += h[n - 2] * (1.0 + r_right)
+    sub[m - 1] -= h[n - 2] * r_right
+    
+    # 追赶法 (Thomas algorithm)
+    for i in range(1, m):
+        w = sub[i] / diag[i - 1]
+        diag[i] -= w * sup[i - 1]
+        rhs[i] -= w * rhs[i - 1]
+    
+    M = np.empty(n)
+    M[m] = rhs[m - 1] / diag[m - 1]
+    for i in range(m - 2, -1, -1):
+        M[i + 1] = (rhs[i] - sup[i] * M[i + 2]) / diag[i]
+    M[0] = (1.0 + r_left) * M[1] - r_left * M[2]
+    M[n - 1] = (1.0 + r_right) * M[n - 2] - r_right * M[n - 3]
+    
+    # 分段三次多项式求值
+    idx = np.searchsorted(xs, xeval) - 1
+    idx = np.minimum(np.maximum(idx, 0), n - 2)
+    hi = h[idx]
+    a = (xs[idx + 1] - xeval) / hi
+    b = 1.0 - a
+    return (a * ys[idx] + b * ys[idx + 1]
+            + ((a ** 3 - a) * M[idx] + (b ** 3 - b) * M[idx + 1]) * hi * hi / 6.0)
+
+
+def assemble_polygon(outer_x, outer_y, inner_x, inner_y):
+    """
+    由上半部分的外/内边缘拼接出关于x轴对称的闭合多边形
+    
+    顶点顺序: 上外边缘(从左到右) -> 上内边缘(从右到左) -> 下内边缘(从左到右) -> 下外边缘(从右到左)
+    
+    参数:
+        outer_x, outer_y: 上半部分外边缘点坐标
+        inner_x, inner_y: 上半部分内边缘点坐标
+        
+    返回:
+        polygon_points: 多边形顶点坐标数组 (N, 2)
+    """
+    n_o = len(outer_x)
+    n_i = len(inner_x)
+    polygon_points = np.empty((2 * (n_o + n_i), 2))
+    
+    # 上半部分外边缘点 (从左到右)
+    upper_outer = polygon_points[:n_o]
+    upper_outer[:, 0] = outer_x
+    upper_outer[:, 1] = outer_y
+    
+    # 上半部分内边缘点 (从右到左)
+    upper_inner = polygon_points[n_o:n_o + n_i]
+    upper_inner[:, 0] = inner_x[::-1]
+    upper_inner[:, 1] = inner_y[::-1]
+    
+    # 下半部分内边缘点 (从左到右，对称)
+    lower_inner = polygon_points[n_o + n_i:n_o + 2 * n_i]
+    lower_inner[:, 0] = inner_x
+    lower_inner[:, 1] = -inner_y
+    
+    # 下半部分外边缘点 (从右到左，对称)
+    lower_outer = polygon_points[n_o + 2 * n_i:]
+    lower_outer[:, 0] = outer_x[::-1]
+    lower_outer[:, 1] = -outer_y[::-1]
+    
+    return polygon_points
+
+
+@lru_cache(maxsize=None)
+def extended_knots_x(x_start, x_stop, n_knots, extend_left, extend_right):
+    """
+    返回两端延伸后的样条节点x坐标（只依赖节点布局，按参数缓存）
+    
+    参数:
+        x_start, x_stop: 可优化节点的x范围
+        n_knots: 可优化节点数量
+        extend_left, extend_right: 左/右两侧延伸距离
+        
+    返回:
+        points_x: 节点x坐标，长度n_knots+2（只读）
+    """
+    points_x = np.empty(n_knots + 2)
+    points_x[0] = x_start - extend_left
+    points_x[1:-1] = np.linspace(x_start, x_stop, n_knots)
+    points_x[-1] = x_stop + extend_right
+    points_x.setflags(write=False)
+    return points_x
+
+
+@lru_cache(maxsize=128)
+def _geometry_polygon_cached(params_bytes, n_points):
+    """
+    根据参数字节串构建多边形（结果按参数缓存）
+    
+    参数:
+        params_bytes: float64参数数组的字节串
+        n_points: 样条节点数量
+        
+    返回:
+        polygon_points: 多边形顶点坐标数组 (N, 2)
+    """
+    params = np.frombuffer(params_bytes, dtype=np.float64)
+    
+    # 1. 构建上边缘 (Outer Top)
+    # 节点x范围 -1.0μm ~ 1.0μm，两侧各延伸0.1μm
+    points_x = extended_knots_x(-1.0e-6, 1.0e-6, n_points, 0.1e-6, 0.1e-6)
+    
+    points_y = np.empty(n_points + 2)
+    points_y[0] = params[0]       # 左端保持输入波导宽度
+    points_y[1:-1] = params
+    points_y[-1] = params[-1]     # 右端保持输出波导位置
+    
+    # 使用三次样条插值创建平滑曲线
+    polygon_points_x = _POLYGON_POINTS_X
+    polygon_points_y = cubic_spline_eval(points_x, points_y, polygon_points_x)
+    
+    # 2. 内边缘 (Inner Split) 与参数无关，直接使用预先计算的线性过渡
+    inner_x = _INNER_EDGE[:, 0]
+    inner_y = _INNER_EDGE[:, 1]
+    
+    # 3. 组合多边形
+    return assemble_polygon(polygon_points_x, polygon_points_y, inner_x, inner_y)
+
+
 def export_to_gds(polygon_points, filename='y_branch_optimized.gds', layer=1):
     """
     将优化后的几何体导出为GDS文件
@@ -19,6 +19,7 @@ if paths_to_remove:
 # -- 环境修复结束 --
 
 import numpy as np
+from functools import lru_cache
 import os
 os.environ['LUMERICAL_GPU'] = '1'
 
@@ -46,7 +47,109 @@ except ImportError as e:
     print("警告: 未找到lumopt库")
     print(f"错误信息: {e}")
 
+# 材料定义（使用FDTD自带材料库名称），只创建一次供每次优化复用
+if LUMOPT_AVAILABLE:
+    _SI_PALIK = Material(name='Si (Silicon) - Palik', mesh_order=2)
+    _SIO2_PALIK = Material(name='SiO2 (Glass) - Palik', mesh_order=3)
 
+from y_branch_geometry import assemble_polygon, cubic_spline_eval, extended_knots_x
+
+
+# 样条插值采样点（与参数取值无关，只计算一次）
+# 外边缘: -1.0μm ~ 1.0μm 两侧各延伸0.1μm
+_POLY_X_OUTER = np.linspace(-1.1e-6, 1.1e-6, 100)
+# 内边缘: 仅在分叉后 (x >= 0) 存在，输出侧延伸0.1μm
+_POLY_X_INNER = np.linspace(0.0, 1.1e-6, 50)
+# 单参数扰动不超过该步长时增量更新（lumopt有限差分步长dx=1nm）
+_PERTURBATION_MAX_STEP = 2.0e-9
+
+# 最近一次非扰动请求（基准）的参数及外/内边缘插值点y坐标
+_PREV = {"params": None, "poly_y_outer": None, "poly_y_inner": None}
+
+
+def _splitter_knots_x(n_outer, n_inner):
+    """
+    返回外/内边缘扩展后的样条节点x坐标（只读，按数量缓存）
+    
+    参数:
+        n_outer: 外边缘参数数量
+        n_inner: 内边缘参数数量
+        
+    返回:
+        (points_x_outer, points_x_inner): 外/内边缘节点x坐标
+    """
+    # 外边缘 x范围: -1.0 到 1.0，两侧各延伸0.1以确保连接
+    points_x_outer = extended_knots_x(-1.0e-6, 1.0e-6, n_outer, 0.1e-6, 0.1e-6)
+    # 内边缘 x范围: 0.0 到 1.0 (仅在分叉后存在)，向左微延确保尖端闭合
+    points_x_inner = extended_knots_x(0.0, 1.0e-6, n_inner, 0.05e-6, 0.1e-6)
+    return points_x_outer, points_x_inner
+
+
+@lru_cache(maxsize=None)
+def _spline_basis(n_outer, n_inner):
+    """
+    返回插值点y坐标对各参数的线性响应矩阵（只依赖参数数量，按数量缓存）
+    
+    样条插值关于节点y坐标是线性的，第j列即第j个参数取1、其余取0时的插值结果
+    
+    参数:
+        n_outer: 外边缘参数数量
+        n_inner: 内边缘参数数量
+        
+    返回:
+        (basis_outer, basis_inner): 形状为 (插值点数, 参数数量) 的矩阵（只读）
+    """
+    points_x_outer, points_x_inner = _splitter_knots_x(n_outer, n_inner)
+    
+    def basis(points_x, poly_x, n):
+        result = np.empty((poly_x.shape[0], n))
+        for j in range(n):
+            # 与构建时相同的首尾延伸规则
+            points_y = np.zeros(n + 2)
+            points_y[j + 1] = 1.0
+            points_y[0] = points_y[1]
+            points_y[-1] = points_y[-2]
+            result[:, j] = cubic_spline_eval(points_x, points_y, poly_x)
+        result.setflags(write=False)
+        return result
+    
+    return (basis(points_x_outer, _POLY_X_OUTER, n_outer),
+            basis(points_x_inner, _POLY_X_INNER, n_inner))
+
+
+def _perturbed_edges(params, n_outer):
+    """
+    若params相对基准参数只有一个参数发生有限差分量级的变化，
+    利用线性响应矩阵增量计算外/内边缘y坐标
+    
+    参数:
+        params: 参数数组
+        n_outer: 外边缘参数数量
+        
+    返回:
+        (poly_y_outer, poly_y_inner)，不满足增量条件时返回None
+    """
+    prev = _PREV["params"]
+    if prev is None or prev.shape != params.shape:
+        return None
+    
+    changed = np.flatnonzero(params != prev)
+    if changed.size != 1:
+        return None
+    
+    k = changed[0]
+    delta = params[k] - prev[k]
+    if abs(delta) > _PERTURBATION_MAX_STEP:
+        return None
+    
+    basis_outer, basis_inner = _spline_basis(n_outer, len(params) - n_outer)
+    poly_y_outer = _PREV["poly_y_outer"]
+    poly_y_inner = _PREV["poly_y_inner"]
+    if k < n_outer:
+        poly_y_outer = poly_y_outer + delta * basis_outer[:, k]
+    else:
+        poly_y_inner = poly_y_inner + delta * basis_inner[:, k - n_outer]
+    return poly_y_outer, poly_y_inner
 
 
 def splitter_function(params):
@@ -61,91 +164,103 @@ def splitter_function(params):
     返回:
         polygon_points: 多边形顶点数组
     """
-    from scipy.interpolate import interp1d
+    params = np.ascontiguousarray(params, dtype=np.float64)
+    n_outer = len(params) // 2
+    
+    # 有限差分梯度每次只扰动一个参数，此时在最近一次请求的基准参数上增量更新
+    edges = _perturbed_edges(params, n_outer)
+    if edges is None:
+        # 相同参数（梯度计算、线搜索回退）直接复用缓存结果
+        edges = _splitter_edges_cached(params.tobytes(), n_outer)
+        # 无论是否命中缓存都记录为新的基准，后续扰动均相对该基准计算
+        _PREV["params"] = params.copy()
+        _PREV["poly_y_outer"], _PREV["poly_y_inner"] = edges
+    poly_y_outer, poly_y_inner = edges
+    
+    # ==========================================
+    # 3. 组合多边形
+    # ==========================================
+    
+    # 外边缘直接用全长，内边缘从分叉点开始，上下关于x轴对称
+    return assemble_polygon(_POLY_X_OUTER, poly_y_outer, _POLY_X_INNER, poly_y_inner)
+
+
+@lru_cache(maxsize=128)
+def _splitter_edges_cached(params_bytes, n_outer):
+    """
+    根据参数字节串计算外/内边缘插值点y坐标（结果按参数缓存）
+    
+    参数:
+        params_bytes: float64参数数组的字节串
+        n_outer: 外边缘参数数量
+        
+    返回:
+        (poly_y_outer, poly_y_inner): 外/内边缘插值点y坐标（只读）
+    """
+    params = np.frombuffer(params_bytes, dtype=np.float64)
     
     # 确定参数数量分配
     n_total = len(params)
-    n_outer = n_total // 2
     n_inner = n_total - n_outer
     
     params_outer = params[:n_outer]
     params_inner = params[n_outer:]
     
+    points_x_outer, points_x_inner = _splitter_knots_x(n_outer, n_inner)
+    
     # ==========================================
     # 1. 构建上边缘 (Outer Top)
     # ==========================================
-    # x范围: -1.0 到 1.0
-    outer_x_knots = np.linspace(-1.0e-6, 1.0e-6, n_outer)
-    
     # 扩展点以确保连接
-    points_x_outer = np.concatenate((
-        [outer_x_knots.min() - 0.1e-6],  # 输入侧延伸
-        outer_x_knots,
-        [outer_x_knots.max() + 0.1e-6]   # 输出侧延伸
-    ))
-    
-    points_y_outer = np.concatenate((
-        [params_outer[0]],      # 左端保持输入波导宽度
-        params_outer,           # 中间优化区域
-        [params_outer[-1]]      # 右端保持输出波导位置
-    ))
+    points_y_outer = np.empty(n_outer + 2)
+    points_y_outer[0] = params_outer[0]       # 左端保持输入波导宽度
+    points_y_outer[1:-1] = params_outer       # 中间优化区域
+    points_y_outer[-1] = params_outer[-1]     # 右端保持输出波导位置
     
     # 样条插值 - 外边缘
-    n_interp = 100
-    poly_x_outer = np.linspace(min(points_x_outer), max(points_x_outer), n_interp)
-    interp_outer = interp1d(points_x_outer, points_y_outer, kind='cubic')
-    poly_y_outer = interp_outer(poly_x_outer)
+    poly_y_outer = cubic_spline_eval(points_x_outer, points_y_outer, _POLY_X_OUTER)
     
     # ==========================================
     # 2. 构建内边缘 (Inner Split)
     # ==========================================
-    # x范围: 0.0 到 1.0 (仅在分叉后存在)
-    inner_x_knots = np.linspace(0.0e-6, 1.0e-6, n_inner)
-    
     # 扩展点
-    points_x_inner = np.concatenate((
-        [inner_x_knots.min() - 0.05e-6], # 向左微延，确保尖端闭合
-        inner_x_knots,
-        [inner_x_knots.max() + 0.1e-6]   # 输出侧延伸
-    ))
-    
-    points_y_inner = np.concatenate((
-        [params_inner[0]],      # 分叉点
-        params_inner,           # 中间优化区域
-        [params_inner[-1]]      # 右端内侧位置
-    ))
+    points_y_inner = np.empty(n_inner + 2)
+    points_y_inner[0] = params_inner[0]       # 分叉点
+    points_y_inner[1:-1] = params_inner       # 中间优化区域
+    points_y_inner[-1] = params_inner[-1]     # 右端内侧位置
     
     # 样条插值 - 内边缘
     # 注意：内边缘的插值范围只在 x >= 0
-    poly_x_inner = np.linspace(0.0, max(points_x_inner), 50)
-    interp_inner = interp1d(points_x_inner, points_y_inner, kind='cubic')
-    poly_y_inner = interp_inner(poly_x_inner)
-    
-    # ==========================================
-    # 3. 组合多边形
-    # ==========================================
-    
-    # 上半部分外边缘点 (从左到右)
-    # 过滤掉 x > 0 的部分用于和内边缘拼接? 不需要，直接用全长
-    upper_outer = list(zip(poly_x_outer, poly_y_outer))
+    poly_y_inner = cubic_spline_eval(points_x_inner, points_y_inner, _POLY_X_INNER)
     
-    # 上半部分内边缘点 (从右到左)
-    upper_inner = list(zip(poly_x_inner, poly_y_inner))[::-1]
+    # 缓存结果只读，防止调用方修改
+    poly_y_outer.setflags(write=False)
+    poly_y_inner.setflags(write=False)
+    return poly_y_outer, poly_y_inner
+
+
+def batch_polygons(params_batch):
+    """
+    批量构建多组参数对应的多边形（如有限差分的各个扰动参数）
     
-    # 下半部分内边缘点 (从左到右，对称)
-    lower_inner = [(x, -y) for x, y in zip(poly_x_inner, poly_y_inner)]
+    numba可用时按参数组并行计算，否则逐组串行计算
     
-    # 下半部分外边缘点 (从右到左，对称)
-    lower_outer = [(x, -y) for x, y in upper_outer[::-1]]
+    参数:
+        params_batch: 参数数组 (n_batch, n_params)
+        
+    返回:
+        polygons: 多边形顶点数组 (n_batch, n_vertices, 2)
+    """
+    params_batch = np.ascontiguousarray(np.atleast_2d(params_batch), dtype=np.float64)
+    n_total = params_batch.shape[1]
+    n_outer = n_total // 2
+    points_x_outer, points_x_inner = _splitter_knots_x(n_outer, n_total - n_outer)
     
-    # 组合所有点
-    final_points = []
-    final_points.extend(upper_outer)
-    final_points.extend(upper_inner)
-    final_points.extend(lower_inner)
-    final_points.extend(lower_outer)
+    # numba导入较慢，仅在首次批量构建时加载
+    from y_branch_batch import batch_polygons_kernel
     
-    return np.array(final_points)
+    return batch_polygons_kernel(params_batch, n_outer, points_x_outer, points_x_inner,
+                                 _POLY_X_OUTER, _POLY_X_INNER)
 
 
 def run_lumopt_optimization():
@@ -208,9 +323,8 @@ def run_lumopt_optimization():
     print(f"  初始内边缘: {initial_inner[0]*1e6:.3f}μm -> {initial_inner[-1]*1e6:.3f}μm")
     
     # 材料定义
-    # 使用FDTD自带材料库名称
-    eps_in = Material(name='Si (Silicon) - Palik', mesh_order=2)
-    eps_out = Material(name='SiO2 (Glass) - Palik', mesh_order=3)
+    eps_in = _SI_PALIK
+    eps_out = _SIO2_PALIK
     
     # 创建多边形几何体
     depth = 220.0e-9  # 220nm厚度